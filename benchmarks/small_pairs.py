@@ -0,0 +1,55 @@
+"""
+Microbenchmark of the per-pair cost of aligning many short (< 50 items) pairs.
+
+    PYTHONPATH=. python benchmarks/small_pairs.py [number_of_pairs]
+"""
+import random
+import sys
+import timeit
+from functools import partial
+from typing import Any
+
+from minineedle import aligner, core, needle, smith
+
+
+def _random_pairs(number: int, max_length: int = 50) -> list[tuple[str, str]]:
+    rng = random.Random(42)
+    return [
+        (
+            "".join(rng.choice("ACGT") for _ in range(rng.randint(4, max_length - 1))),
+            "".join(rng.choice("ACGT") for _ in range(rng.randint(4, max_length - 1))),
+        )
+        for _ in range(number)
+    ]
+
+
+def _align_with_objects(algorithm: type[core.OptimalAlignment[Any]], pairs: list[tuple[str, str]]) -> None:
+    for seq1, seq2 in pairs:
+        alignment = algorithm(seq1, seq2)
+        alignment.align()
+        alignment.to_result()
+
+
+def _align_with_aligner(reusable: aligner.Aligner, pairs: list[tuple[str, str]]) -> None:
+    for seq1, seq2 in pairs:
+        reusable.align(seq1, seq2)
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for max_length in (8, 16, 48):
+        pairs = _random_pairs(number, max_length)
+        for algorithm in (needle.NeedlemanWunsch, smith.SmithWaterman):
+            reusable = aligner.Aligner(algorithm)
+            objects_time = min(timeit.repeat(partial(_align_with_objects, algorithm, pairs), number=1, repeat=3))
+            aligner_time = min(timeit.repeat(partial(_align_with_aligner, reusable, pairs), number=1, repeat=3))
+            print(
+                f"{algorithm.__name__:<16} length<{max_length:<3} "
+                f"objects: {objects_time / number * 1e6:8.1f} us/pair   "
+                f"Aligner: {aligner_time / number * 1e6:8.1f} us/pair   "
+                f"speedup: {objects_time / aligner_time:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+from minineedle.core import AlignmentResult, OptimalAlignment, ScoreMatrix, _run_length
+from minineedle.needle import NeedlemanWunsch
+from minineedle.smith import SmithWaterman
+
+# Pointer codes stored in the pointers buffer.
+_NONE, _DIAG, _UP, _LEFT = 0, 1, 2, 3
+
+
+class Aligner:
+    """
+    Reusable aligner for many (short) pairs of sequences. Initialization, matrix filling and
+    traceback run in a single method over flat buffers that are kept between calls and only
+    grown when a bigger pair arrives. Buffers bigger than max_buffer_size cells are freed after
+    the alignment, so an occasional long pair does not keep its matrices alive. Results are the
+    same as those of NeedlemanWunsch or SmithWaterman, returned as AlignmentResult objects.
+    """
+
+    def __init__(self, algorithm: type[OptimalAlignment[Any]] = NeedlemanWunsch, max_buffer_size: int = 65536) -> None:
+        """
+        Args:
+            algorithm: NeedlemanWunsch or SmithWaterman.
+            max_buffer_size: Maximum number of matrix cells kept between calls (by default enough
+                for pairs of 255 items).
+        """
+        if algorithm not in (NeedlemanWunsch, SmithWaterman):
+            raise ValueError("Algorithm should be NeedlemanWunsch or SmithWaterman.")
+        if max_buffer_size < 0:
+            raise ValueError("max_buffer_size cannot be negative.")
+
+        self.algorithm = algorithm
+        self.smatrix = ScoreMatrix(match=1, miss=-1, gap=-1)
+        self.max_buffer_size = max_buffer_size
+        self._local = algorithm is SmithWaterman
+        self._scores: list[int | float] = []
+        self._pointers = bytearray()
+
+    @property
+    def buffer_size(self) -> int:
+        """
+        Number of matrix cells currently kept between calls.
+        """
+        return len(self._scores)
+
+    def change_matrix(self, newmatrix: ScoreMatrix) -> None:
+        """
+        Changes ScoreMatrix
+
+        Args:
+            newmatrix (ScoreMatrix): Matrix containing match, miss, and gap penalties.
+        """
+        if isinstance(newmatrix, ScoreMatrix):
+            self.smatrix = newmatrix
+        else:
+            raise ValueError("New matrix should be a ScoreMatrix object.")
+
+    def align(self, seq1: Sequence[Any], seq2: Sequence[Any]) -> AlignmentResult:
+        """
+        Aligns seq1 and seq2 and returns the AlignmentResult. Items are compared directly, so
+        str inputs are not converted.
+        """
+        len1, len2 = len(seq1), len(seq2)
+        width = len1 + 1
+        self._initialize_buffers(width, len2 + 1)
+        scores, pointers = self._scores, self._pointers
+        match, miss, gap = self.smatrix.match, self.smatrix.miss, self.smatrix.gap
+        local = self._local
+
+        for irow in range(len2):
+            item2 = seq2[irow]
+            top = irow * width
+            current = top + width
+            score: int | float = scores[current]
+            for jcol in range(len1):
+                diagscore = scores[top + jcol] + (match if seq1[jcol] == item2 else miss)
+                topscore = scores[top + jcol + 1] + gap
+                leftscore = score + gap
+                if diagscore >= topscore:
+                    if diagscore >= leftscore:
+                        pointer, score = _DIAG, diagscore
+                    else:
+                        pointer, score = _LEFT, leftscore
+                elif topscore > leftscore:
+                    pointer, score = _UP, topscore
+                else:
+                    pointer, score = _LEFT, leftscore
+                if local and score < 0:
+                    pointer, score = _NONE, 0
+                scores[current + jcol + 1] = score
+                pointers[current + jcol + 1] = pointer
+
+        imax, jmax = self._get_best_cell(width, len2 + 1) if local else (len2, len1)
+        try:
+            return self._trace_back(seq1, seq2, width, imax, jmax)
+        finally:
+            if len(self._scores) > self.max_buffer_size:
+                self._scores = []
+                self._pointers = bytearray()
+
+    def _initialize_buffers(self, width: int, height: int) -> None:
+        """
+        Grows the buffers if needed and fills the first row and column, as _add_initial_pointers
+        and _add_gap_penalties do.
+        """
+        size = width * height
+        if size > len(self._scores):
+            self._scores = [0] * size
+            self._pointers = bytearray(size)
+        scores, pointers = self._scores, self._pointers
+        gap = 0 if self._local else self.smatrix.gap
+
+        scores[0] = 0
+        pointers[0] = _NONE
+        for jcol in range(1, width):
+            scores[jcol] = scores[jcol - 1] + gap
+            pointers[jcol] = _LEFT
+        for irow in range(1, height):
+            scores[irow * width] = scores[(irow - 1) * width] + gap
+            pointers[irow * width] = _UP
+
+    def _get_best_cell(self, width: int, height: int) -> tuple[int, int]:
+        """
+        Returns the row and column of the first cell (in row order) with the highest positive
+        score, or (0, 0), as SmithWaterman._get_last_cell_position does.
+        """
+        size = width * height
+        best_score = max(self._scores[:size])
+        if best_score > 0:
+            return divmod(self._scores.index(best_score, 0, size), width)
+        return 0, 0
+
+    def _trace_back(
+        self, items1: Sequence[Any], items2: Sequence[Any], width: int, irow: int, jcol: int
+    ) -> AlignmentResult:
+        scores, pointers = self._scores, self._pointers
+        score = scores[irow * width + jcol]
+        end1, end2 = jcol, irow
+        operations: list[str] = []
+        matches = 0
+        while True:
+            pointer = pointers[irow * width + jcol]
+            if pointer == _DIAG:
+                if items1[jcol - 1] == items2[irow - 1]:
+                    matches += 1
+                    operations.append("=")
+                else:
+                    operations.append("X")
+                irow -= 1
+                jcol -= 1
+            elif pointer == _UP:
+                operations.append("I")
+                irow -= 1
+            elif pointer == _LEFT:
+                operations.append("D")
+                jcol -= 1
+            else:
+                break
+        operations.reverse()
+
+        identity = matches / len(operations) * 100 if operations else 0.0
+        return AlignmentResult(
+            score=score,
+            identity=round(identity, 2),
+            start1=jcol,
+            end1=end1,
+            start2=irow,
+            end2=end2,
+            edit_script="".join(f"{length}{operation}" for length, operation in _run_length(operations)),
+        )
+
+
+def align_pairs(
+    pairs: Sequence[tuple[Sequence[Any], Sequence[Any]]],
+    algorithm: type[OptimalAlignment[Any]] = NeedlemanWunsch,
+    smatrix: Optional[ScoreMatrix] = None,
+) -> list[AlignmentResult]:
+    """
+    Aligns every (seq1, seq2) pair with a single reusable Aligner.
+    """
+    aligner = Aligner(algorithm)
+    if smatrix is not None:
+        aligner.change_matrix(smatrix)
+    return [aligner.align(seq1, seq2) for seq1, seq2 in pairs]
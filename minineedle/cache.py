@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+from minineedle.core import AlignmentResult, OptimalAlignment, ScoreMatrix
+from minineedle.typesvars import ItemToAlign
+
+# Salt of the cache keys. Change it whenever the keys or the alignment results change, so that
+# results stored in a database by an older version are not served.
+_KEY_VERSION = "minineedle-cache-v1"
+# Bytes counted for the numeric fields of a result (score, identity and the four coordinates).
+_RESULT_FIELDS_SIZE = 48
+
+
+class CacheStats:
+    """
+    Hit and miss counters of an AlignmentCache. Disk hits are also counted as hits.
+    """
+
+    __slots__ = ("hits", "misses", "disk_hits", "evictions")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(hits={self.hits}, misses={self.misses}, disk_hits={self.disk_hits}, "
+            f"evictions={self.evictions}, hit_rate={self.hit_rate:.2f})"
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class AlignmentCache:
+    """
+    Content-addressed cache of alignment results. Results are keyed on a hash of both sequences,
+    the alignment class and the ScoreMatrix, and kept in an in-memory LRU bounded by size in bytes.
+    If a path is given, results are also stored in a sqlite database there, which survives
+    evictions and restarts.
+
+    The size of a result is counted as 48 bytes for its numeric fields plus the length of its
+    edit script.
+
+    Only str, bytes and bytearray sequences, or sequences of int, str, bytes and tuples of those,
+    can be keyed by content. Other sequences are aligned without caching and counted as misses.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, path: Optional[str] = None) -> None:
+        """
+        Args:
+            max_bytes: Maximum size of the results kept in memory.
+            path: Optional sqlite database file where results are also stored.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative.")
+
+        self.max_bytes = max_bytes
+        self.path = path
+        self.stats = CacheStats()
+        self._results: OrderedDict[str, tuple[AlignmentResult, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            # score has no declared type so that sqlite keeps ints and floats as they are.
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results_v1 (key TEXT PRIMARY KEY, score NOT NULL, identity REAL NOT NULL, "
+                "start1 INTEGER NOT NULL, end1 INTEGER NOT NULL, start2 INTEGER NOT NULL, end2 INTEGER NOT NULL, "
+                "edit_script TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._results
+
+    def __enter__(self) -> AlignmentCache:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """
+        Size in bytes of the results kept in memory.
+        """
+        return self._size
+
+    def align(
+        self,
+        algorithm: type[OptimalAlignment[ItemToAlign]],
+        seq1: Sequence[ItemToAlign],
+        seq2: Sequence[ItemToAlign],
+        smatrix: Optional[ScoreMatrix] = None,
+    ) -> AlignmentResult:
+        """
+        Returns the AlignmentResult of aligning seq1 and seq2 with the given algorithm
+        (e.g. NeedlemanWunsch or SmithWaterman) and ScoreMatrix, running the alignment only
+        if it is not cached.
+        """
+        smatrix = smatrix if smatrix is not None else ScoreMatrix(match=1, miss=-1, gap=-1)
+        key = self.get_key(algorithm, seq1, seq2, smatrix)
+        result = self.get(key) if key is not None else None
+        if result is None:
+            alignment = algorithm(seq1, seq2)
+            alignment.change_matrix(smatrix)
+            result = alignment.to_result()
+            if key is not None:
+                self.put(key, result)
+            else:
+                with self._lock:
+                    self.stats.misses += 1
+        return result
+
+    def get(self, key: str) -> Optional[AlignmentResult]:
+        """
+        Returns the cached result for the key, or None, updating the statistics.
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.stats.hits += 1
+                return self._results[key][0]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT score, identity, start1, end1, start2, end2, edit_script FROM results_v1 WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    result = AlignmentResult(*row)
+                    self._store(key, result)
+                    self.stats.hits += 1
+                    self.stats.disk_hits += 1
+                    return result
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: str, result: AlignmentResult) -> None:
+        """
+        Stores a result in memory and, if the cache has a path, in the database.
+        """
+        with self._lock:
+            self._store(key, result)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results_v1 VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        result.score,
+                        result.identity,
+                        result.start1,
+                        result.end1,
+                        result.start2,
+                        result.end2,
+                        result.edit_script,
+                    ),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        """
+        Removes all the results kept in memory and resets the statistics. The database is kept.
+        """
+        with self._lock:
+            self._results.clear()
+            self._size = 0
+            self.stats = CacheStats()
+
+    def close(self) -> None:
+        """
+        Closes the database, if any.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @staticmethod
+    def get_key(
+        algorithm: type[OptimalAlignment[ItemToAlign]],
+        seq1: Sequence[ItemToAlign],
+        seq2: Sequence[ItemToAlign],
+        smatrix: ScoreMatrix,
+    ) -> Optional[str]:
+        """
+        Returns the hex digest identifying an alignment of seq1 and seq2 with the given algorithm and ScoreMatrix,
+        or None if any of the sequences contains items that cannot be keyed by content.
+        """
+        encoded1 = _encode_sequence(seq1)
+        encoded2 = _encode_sequence(seq2)
+        if encoded1 is None or encoded2 is None:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(f"{_KEY_VERSION}\0".encode())
+        digest.update(f"{algorithm.__module__}.{algorithm.__qualname__}\0".encode())
+        digest.update(f"{smatrix.match!r}\0{smatrix.miss!r}\0{smatrix.gap!r}\0".encode())
+        digest.update(encoded1)
+        digest.update(encoded2)
+        return digest.hexdigest()
+
+    def _store(self, key: str, result: AlignmentResult) -> None:
+        size = _RESULT_FIELDS_SIZE + len(result.edit_script)
+        if key in self._results:
+            self._size -= self._results.pop(key)[1]
+        if size > self.max_bytes:
+            return
+
+        self._results[key] = (result, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._results.popitem(last=False)
+            self._size -= evicted_size
+            self.stats.evictions += 1
+
+
+def _encode_sequence(sequence: Sequence[Any]) -> Optional[bytes]:
+    """
+    Serializes a sequence for the cache key, prefixed by its kind and length so that different
+    sequences (or a str and a list of its characters) never produce the same bytes. Returns None
+    for sequences with items whose serialization is not stable (e.g. objects with the default
+    repr, which only contains their memory address).
+    """
+    if isinstance(sequence, str):
+        return _encode_item(sequence)
+    if isinstance(sequence, (bytes, bytearray)):
+        return _encode_item(bytes(sequence))
+
+    chunks = [f"items:{len(sequence)}\0".encode()]
+    for item in sequence:
+        encoded = _encode_item(item)
+        if encoded is None:
+            return None
+        chunks.append(encoded)
+    return b"".join(chunks)
+
+
+def _encode_item(item: Any) -> Optional[bytes]:
+    """
+    Serializes an int, str, bytes or a tuple of those. Subclasses are rejected, as they may
+    redefine "==".
+    """
+    if type(item) is int:
+        return f"int:{item}\0".encode()
+    if type(item) is str:
+        data = item.encode("utf-8", "surrogatepass")
+        return f"str:{len(data)}\0".encode() + data
+    if type(item) is bytes:
+        return f"bytes:{len(item)}\0".encode() + item
+    if type(item) is tuple:
+        chunks = [f"tuple:{len(item)}\0".encode()]
+        for element in item:
+            encoded = _encode_item(element)
+            if encoded is None:
+                return None
+            chunks.append(encoded)
+        return b"".join(chunks)
+    return None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from enum import Enum
 from typing import Any, Generic, Literal, Optional, Sequence, overload
 
@@ -7,7 +8,7 @@ from minineedle.typesvars import ItemToAlign
 
 
 class ScoreMatrix:
-    def __init__(self, match: int, miss: int, gap: int) -> None:
+    def __init__(self, match: int | float, miss: int | float, gap: int | float) -> None:
         self.match = match
         self.miss = miss
         self.gap = gap
@@ -27,23 +28,23 @@ class OptimalAlignment(Generic[ItemToAlign]):
         self.seq2 = seq2
         self._alseq1: list[ItemToAlign | Gap] = []
         self._alseq2: list[ItemToAlign | Gap] = []
+        self._operations: list[str] = []
+        self._aligned = False
         self.smatrix = ScoreMatrix(match=1, miss=-1, gap=-1)
-        self._score = int()
+        self._score: int | float = int()
         self._identity = float()
-        self._nmatrix = self._initialize_number_matrix()
-        self._pmatrix = self._initialize_pointers_matrix()
+        self._start: tuple[int, int] = (0, 0)
+        self._end: tuple[int, int] = (0, 0)
+        # Matrices are allocated by align()
+        self._nmatrix: list[list[int | float]] = []
+        self._pmatrix: list[list[Optional[str]]] = []
         self._gap_character = "-"
 
         self._is_iterable(self.seq1)
         self._is_iterable(self.seq2)
 
     def __str__(self) -> str:
-        return "Alignment of {} and {}:\n\t{}\n\t{}\n".format(
-            "SEQUENCE 1",
-            "SEQUENCE 2",
-            "".join([str(x) for x in self._alseq1]),
-            "".join([str(x) for x in self._alseq2]),
-        )
+        return "Alignment of {} and {}:\n\t{}\n\t{}\n".format("SEQUENCE 1", "SEQUENCE 2", *self._get_aligned_strings())
 
     def __lt__(self, other: Any) -> bool:
         if not isinstance(other, OptimalAlignment):
@@ -72,7 +73,7 @@ class OptimalAlignment(Generic[ItemToAlign]):
         iter(iterable)
 
     def get_score(self) -> int | float:
-        if not self._alseq1:
+        if not self._aligned:
             self.align()
         return self._score
 
@@ -93,6 +94,9 @@ class OptimalAlignment(Generic[ItemToAlign]):
         Performs a Needleman-Wunsch or Smith-Waterman alignment with the given sequences and the
         corresponding ScoreMatrix.
         """
+        if not self._nmatrix:
+            self._nmatrix = self._initialize_number_matrix()
+            self._pmatrix = self._initialize_pointers_matrix()
         self._add_initial_pointers()
         self._add_gap_penalties()
         self._fill_matrices()
@@ -100,12 +104,39 @@ class OptimalAlignment(Generic[ItemToAlign]):
         imax, jmax = self._get_last_cell_position()
         self._get_alignment_score(imax, jmax)
         self._trace_back_alignment(imax, jmax)
+        self._end = (jmax, imax)
+        self._aligned = True
+
+    def to_result(self) -> AlignmentResult:
+        """
+        Returns a lightweight AlignmentResult with the score, identity, coordinates and edit script
+        of the alignment. It runs align() if it has not been done yet.
+        """
+        if not self._aligned:
+            self.align()
+        return AlignmentResult(
+            score=self._score,
+            identity=self.get_identity(),
+            start1=self._start[0],
+            end1=self._end[0],
+            start2=self._start[1],
+            end2=self._end[1],
+            edit_script=self._get_edit_script(),
+        )
+
+    def release_matrices(self) -> None:
+        """
+        Frees the score and pointer matrices. They will be allocated again if align() or
+        get_almatrix() are called.
+        """
+        self._nmatrix = []
+        self._pmatrix = []
 
-    def get_almatrix(self) -> list[list[int]]:
+    def get_almatrix(self) -> list[list[int | float]]:
         """
         Returns the alignment matrix (list of lists)
         """
-        if not self._alseq1:
+        if not self._aligned or not self._nmatrix:
             self.align()
         return self._nmatrix
 
@@ -113,7 +144,7 @@ class OptimalAlignment(Generic[ItemToAlign]):
         """
         Returns the % of identity of the alignment
         """
-        if not self._alseq1:
+        if not self._aligned:
             self.align()
         return round(self._identity, 2)  # Two decimal points
 
@@ -136,11 +167,23 @@ class OptimalAlignment(Generic[ItemToAlign]):
         if sequence_format == AlignmentFormat.list:
             return self._change_gap_char(self._alseq1), self._change_gap_char(self._alseq2)
         elif sequence_format == AlignmentFormat.str:
+            return self._get_aligned_strings()
+        else:
+            raise ValueError("Sequence_format has to be either 'list' or 'str'!")
+
+    def _get_aligned_strings(self) -> tuple[str, str]:
+        """
+        Returns both aligned sequences as strings. For str/bytes inputs they are built by joining
+        slices of the original sequences and gap runs, instead of calling str() on every item.
+        """
+        texts = _get_texts(self.seq1, self.seq2)
+        if texts is None:
             return "".join([str(x) for x in self._change_gap_char(self._alseq1)]), "".join(
                 [str(x) for x in self._change_gap_char(self._alseq2)]
             )
-        else:
-            raise ValueError("Sequence_format has to be either 'list' or 'str'!")
+        return _join_aligned_texts(
+            *texts, self._start[0], self._start[1], _run_length(self._operations), self._gap_character
+        )
 
     def _change_gap_char(self, iterable: list[ItemToAlign | Gap]) -> list[ItemToAlign | Gap]:
         new_sequence: list[ItemToAlign | Gap] = []
@@ -150,6 +193,13 @@ class OptimalAlignment(Generic[ItemToAlign]):
             new_sequence.append(it)
         return new_sequence
 
+    def _get_edit_script(self) -> str:
+        """
+        Returns the run-length encoded edit script of the alignment, using "=" for matches,
+        "X" for mismatches, "I" for items only in seq2 and "D" for items only in seq1.
+        """
+        return "".join(f"{length}{operation}" for length, operation in _run_length(self._operations))
+
     def _add_initial_pointers(self) -> None:
         """
         Fills the pointers matrix first row with "left" pointer and
@@ -184,7 +234,7 @@ class OptimalAlignment(Generic[ItemToAlign]):
         """
         raise NotImplementedError("NeedlemanWunsch or SmithWaterman should be used instead!")
 
-    def _initialize_number_matrix(self) -> list[list[int]]:
+    def _initialize_number_matrix(self) -> list[list[int | float]]:
         """
         Initializes the matrix where the computed scores are stored.
         """
@@ -197,45 +247,56 @@ class OptimalAlignment(Generic[ItemToAlign]):
         return [[None for x in range(len(self.seq1) + 1)] for x in range(len(self.seq2) + 1)]
 
     def _fill_matrices(self) -> None:
-        for irow in range(0, len(self.seq2)):
-            for jcol in range(0, len(self.seq1)):
+        match, miss, gap = self.smatrix.match, self.smatrix.miss, self.smatrix.gap
+        check_best_score = self._check_best_score
+        for irow, item2 in enumerate(self.seq2):
+            previous_row = self._nmatrix[irow]
+            current_row = self._nmatrix[irow + 1]
+            for jcol, item1 in enumerate(self.seq1):
                 # Scores
-                topscore = self._nmatrix[irow][jcol + 1] + self.smatrix.gap
-                leftscore = self._nmatrix[irow + 1][jcol] + self.smatrix.gap
-                diagscore = self._nmatrix[irow][jcol]
-                if self.seq1[jcol] == self.seq2[irow]:
-                    diagscore += self.smatrix.match
-                else:
-                    diagscore += self.smatrix.miss
+                topscore = previous_row[jcol + 1] + gap
+                leftscore = current_row[jcol] + gap
+                diagscore = previous_row[jcol] + (match if item1 == item2 else miss)
 
-                self._check_best_score(diagscore, topscore, leftscore, irow, jcol)
+                check_best_score(diagscore, topscore, leftscore, irow, jcol)
 
     def _trace_back_alignment(self, irow: int, jcol: int) -> None:
         self._alseq1, self._alseq2 = [], []
-        
+        self._operations = []
+        self._identity = float()
+
         while True:
             if self._pmatrix[irow][jcol] == "diag":
                 self._alseq1.append(self.seq1[jcol - 1])
                 self._alseq2.append(self.seq2[irow - 1])
                 if self.seq1[jcol - 1] == self.seq2[irow - 1]:
                     self._identity += 1
+                    self._operations.append("=")
+                else:
+                    self._operations.append("X")
                 irow -= 1
                 jcol -= 1
             elif self._pmatrix[irow][jcol] == "up":
                 self._alseq1.append(Gap(self._gap_character))
                 self._alseq2.append(self.seq2[irow - 1])
+                self._operations.append("I")
                 irow -= 1
             elif self._pmatrix[irow][jcol] == "left":
                 self._alseq1.append(self.seq1[jcol - 1])
                 self._alseq2.append(Gap(self._gap_character))
+                self._operations.append("D")
                 jcol -= 1
             else:
                 break
+        self._start = (jcol, irow)
         self._alseq1 = list(reversed(self._alseq1))
         self._alseq2 = list(reversed(self._alseq2))
-        self._identity = (self._identity / len(self._alseq1)) * 100
+        self._operations.reverse()
+        self._identity = (self._identity / len(self._alseq1)) * 100 if self._alseq1 else 0.0
 
-    def _check_best_score(self, diagscore: int, topscore: int, leftscore: int, irow: int, jcol: int) -> None:
+    def _check_best_score(
+        self, diagscore: int | float, topscore: int | float, leftscore: int | float, irow: int, jcol: int
+    ) -> None:
         """
         Decides best score for a given cell. Will change depending if using
         Needleman-Wunsch or Smith-Waterman
@@ -252,3 +313,201 @@ class Gap(object):
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, Gap)
+
+
+class AlignmentResult:
+    """
+    Lightweight result of a pairwise alignment. It does not keep the alignment matrices nor the
+    aligned sequences, which can be rebuilt from the edit script and the original sequences.
+    Coordinates are 0-based and end-exclusive. Results are immutable, so they can be shared
+    (e.g. by AlignmentCache) without copying.
+    """
+
+    __slots__ = ("score", "identity", "start1", "end1", "start2", "end2", "edit_script")
+
+    score: int | float
+    identity: float
+    start1: int
+    end1: int
+    start2: int
+    end2: int
+    edit_script: str
+
+    def __init__(
+        self,
+        score: int | float,
+        identity: float,
+        start1: int,
+        end1: int,
+        start2: int,
+        end2: int,
+        edit_script: str,
+    ) -> None:
+        object.__setattr__(self, "score", score)
+        object.__setattr__(self, "identity", identity)
+        object.__setattr__(self, "start1", start1)
+        object.__setattr__(self, "end1", end1)
+        object.__setattr__(self, "start2", start2)
+        object.__setattr__(self, "end2", end2)
+        object.__setattr__(self, "edit_script", edit_script)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self) -> tuple[type[AlignmentResult], tuple[Any, ...]]:
+        return (
+            self.__class__,
+            (self.score, self.identity, self.start1, self.end1, self.start2, self.end2, self.edit_script),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(score={self.score}, identity={self.identity}, "
+            f"start1={self.start1}, end1={self.end1}, start2={self.start2}, end2={self.end2}, "
+            f"edit_script={self.edit_script!r})"
+        )
+
+    def __lt__(self, other: Any) -> bool:
+        if not isinstance(other, AlignmentResult):
+            raise ValueError(f"{other} must be instance of {self.__class__.__name__}")
+
+        return self.score < other.score
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AlignmentResult):
+            return NotImplemented
+
+        return self.__reduce__()[1] == other.__reduce__()[1]
+
+    def __hash__(self) -> int:
+        return hash(self.__reduce__()[1])
+
+    def get_operations(self) -> list[tuple[int, str]]:
+        """
+        Returns the edit script as a list of (length, operation) tuples.
+        """
+        return [(int(length), operation) for length, operation in _EDIT_SCRIPT_RE.findall(self.edit_script)]
+
+    @overload
+    def get_aligned_sequences(
+        self,
+        seq1: Sequence[ItemToAlign],
+        seq2: Sequence[ItemToAlign],
+        sequence_format: Literal[AlignmentFormat.str] | Literal["str"],
+        gap_character: str = "-",
+    ) -> tuple[str, str]:
+        ...
+
+    @overload
+    def get_aligned_sequences(
+        self,
+        seq1: Sequence[ItemToAlign],
+        seq2: Sequence[ItemToAlign],
+        sequence_format: Literal[AlignmentFormat.list] | Literal["list"] = "list",
+        gap_character: str = "-",
+    ) -> tuple[list[ItemToAlign | Gap], list[ItemToAlign | Gap]]:
+        ...
+
+    def get_aligned_sequences(
+        self,
+        seq1: Sequence[ItemToAlign],
+        seq2: Sequence[ItemToAlign],
+        sequence_format: Literal["str"] | AlignmentFormat | Literal["list"] = "list",
+        gap_character: str = "-",
+    ) -> tuple[str, str] | tuple[list[ItemToAlign | Gap], list[ItemToAlign | Gap]]:
+        """
+        Rebuilds both aligned sequences from the original sequences and the edit script.
+        """
+        if sequence_format not in (AlignmentFormat.list, AlignmentFormat.str):
+            raise ValueError("Sequence_format has to be either 'list' or 'str'!")
+
+        texts = _get_texts(seq1, seq2)
+        if sequence_format == AlignmentFormat.str and texts is not None:
+            return _join_aligned_texts(*texts, self.start1, self.start2, self.get_operations(), gap_character)
+
+        alseq1: list[ItemToAlign | Gap] = []
+        alseq2: list[ItemToAlign | Gap] = []
+        i, j = self.start1, self.start2
+        for length, operation in self.get_operations():
+            if operation == "I":
+                alseq1.extend(Gap(gap_character) for _ in range(length))
+                alseq2.extend(seq2[j : j + length])
+                j += length
+            elif operation == "D":
+                alseq1.extend(seq1[i : i + length])
+                alseq2.extend(Gap(gap_character) for _ in range(length))
+                i += length
+            else:
+                alseq1.extend(seq1[i : i + length])
+                alseq2.extend(seq2[j : j + length])
+                i += length
+                j += length
+
+        if sequence_format == AlignmentFormat.str:
+            return "".join([str(x) for x in alseq1]), "".join([str(x) for x in alseq2])
+        return alseq1, alseq2
+
+
+_EDIT_SCRIPT_RE = re.compile(r"(\d+)([=XID])")
+
+
+_TEXT_TYPES = (bytes, bytearray)
+
+
+def _run_length(operations: Sequence[str]) -> list[tuple[int, str]]:
+    """
+    Run-length encodes a sequence of edit operations (e.g. "==X=" -> [(2, "="), (1, "X"), (1, "=")]).
+    """
+    runs: list[tuple[int, str]] = []
+    previous, count = "", 0
+    for operation in operations:
+        if operation == previous:
+            count += 1
+        else:
+            if count:
+                runs.append((count, previous))
+            previous, count = operation, 1
+    if count:
+        runs.append((count, previous))
+    return runs
+
+
+def _get_texts(seq1: Sequence[Any], seq2: Sequence[Any]) -> Optional[tuple[str, str]]:
+    """
+    Returns both sequences as str if they are both str or both bytes-like (decoded as latin-1,
+    one character per byte), None otherwise.
+    """
+    if isinstance(seq1, str) and isinstance(seq2, str):
+        return seq1, seq2
+    if isinstance(seq1, _TEXT_TYPES) and isinstance(seq2, _TEXT_TYPES):
+        return bytes(seq1).decode("latin-1"), bytes(seq2).decode("latin-1")
+    return None
+
+
+def _join_aligned_texts(
+    text1: str, text2: str, start1: int, start2: int, runs: Sequence[tuple[int, str]], gap_character: str
+) -> tuple[str, str]:
+    """
+    Builds both aligned strings from slices of the original texts and gap runs, with a single join each.
+    """
+    pieces1: list[str] = []
+    pieces2: list[str] = []
+    i, j = start1, start2
+    for length, operation in runs:
+        if operation == "I":
+            pieces1.append(gap_character * length)
+            pieces2.append(text2[j : j + length])
+            j += length
+        elif operation == "D":
+            pieces1.append(text1[i : i + length])
+            pieces2.append(gap_character * length)
+            i += length
+        else:
+            pieces1.append(text1[i : i + length])
+            pieces2.append(text2[j : j + length])
+            i += length
+            j += length
+    return "".join(pieces1), "".join(pieces2)
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import combinations, islice
+from typing import Any, Generic, Iterator, Literal, Optional, Sequence, Union, overload
+
+from minineedle.core import AlignmentFormat, Gap, ScoreMatrix
+from minineedle.needle import NeedlemanWunsch
+from minineedle.typesvars import ItemToAlign
+
+GuideTree = Union[int, tuple["GuideTree", "GuideTree"]]
+Column = tuple[Any, ...]
+ColumnCounts = tuple[list[list[Any]], int, int]
+
+# Sequences and matrix of the pool worker processes, set once per process by _init_worker.
+_worker_sequences: Sequence[Sequence[Any]] = []
+_worker_smatrix: ScoreMatrix = ScoreMatrix(match=1, miss=-1, gap=-1)
+
+
+class ProgressiveAlignment(Generic[ItemToAlign]):
+    """
+    Progressive multiple sequence alignment. Builds a UPGMA guide tree from the pairwise
+    Needleman-Wunsch distances of all the sequences and then aligns profiles following the tree.
+    """
+
+    def __init__(
+        self, sequences: Sequence[Sequence[ItemToAlign]], workers: int = 1, batch_size: int = 256, max_pending: int = 0
+    ) -> None:
+        """
+        Args:
+            sequences: Sequences to align (any iterables with elements that can be compared with "==").
+            workers: Number of processes used to compute the pairwise distances. With 1 they are
+                computed in the current process.
+            batch_size: Number of sequence pairs sent to a worker in each task.
+            max_pending: Maximum number of tasks submitted at the same time. Defaults to 2 * workers.
+        """
+        if len(sequences) < 2:
+            raise ValueError("At least two sequences are needed for a multiple alignment.")
+        if any(len(sequence) == 0 for sequence in sequences):
+            raise ValueError("Sequences to align cannot be empty.")
+        if workers < 1 or batch_size < 1:
+            raise ValueError("Workers and batch_size have to be positive integers.")
+
+        self.sequences = sequences
+        self.smatrix = ScoreMatrix(match=1, miss=-1, gap=-1)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending or 2 * workers
+        self._distances: dict[tuple[int, int], float] = {}
+        self._guide_tree: Optional[GuideTree] = None
+        self._alignment: list[list[ItemToAlign | Gap]] = []
+        self._score: int | float = int()
+        self._gap_character = "-"
+
+    def __str__(self) -> str:
+        return "Multiple alignment of {} sequences:\n{}\n".format(
+            len(self.sequences),
+            "\n".join("\t" + "".join([str(x) for x in row]) for row in self._alignment),
+        )
+
+    @property
+    def gap_character(self) -> str:
+        return self._gap_character
+
+    @gap_character.setter
+    def gap_character(self, var: str) -> None:
+        self._gap_character = var
+        for row in self._alignment:
+            for it in row:
+                if isinstance(it, Gap):
+                    it.character = var
+
+    def change_matrix(self, newmatrix: ScoreMatrix) -> None:
+        """
+        Changes ScoreMatrix
+
+        Args:
+            newmatrix (ScoreMatrix): Matrix containing match, miss, and gap penalties.
+        """
+        if isinstance(newmatrix, ScoreMatrix):
+            self.smatrix = newmatrix
+        else:
+            raise ValueError("New matrix should be a ScoreMatrix object.")
+
+    def align(self) -> None:
+        """
+        Computes the pairwise distances, the guide tree and the multiple alignment.
+        """
+        self._distances = self._compute_distances()
+        self._guide_tree = self._build_guide_tree()
+        profile, order, self._score = self._align_node(self._guide_tree)
+
+        rows: list[list[ItemToAlign | Gap]] = [[] for _ in order]
+        for column in profile:
+            if len(column) != len(rows):
+                raise ValueError(f"Profile column has {len(column)} items but there are {len(rows)} sequences.")
+            for index, item in enumerate(column):
+                rows[index].append(item)
+        self._alignment = [rows[index] for index in sorted(range(len(order)), key=order.__getitem__)]
+        self.gap_character = self._gap_character
+
+    def get_score(self) -> int | float:
+        """
+        Returns the sum of the scores of the profile alignments.
+        """
+        if not self._alignment:
+            self.align()
+        return self._score
+
+    def get_guide_tree(self) -> GuideTree:
+        """
+        Returns the guide tree as nested tuples of sequence indexes.
+        """
+        if self._guide_tree is None:
+            self.align()
+        assert self._guide_tree is not None
+        return self._guide_tree
+
+    def get_distance(self, i: int, j: int) -> float:
+        """
+        Returns the pairwise distance (1 - identity / 100) between the sequences i and j.
+        """
+        if not self._distances:
+            self.align()
+        if i == j:
+            return 0.0
+        return self._distances[(min(i, j), max(i, j))]
+
+    @overload
+    def get_aligned_sequences(self, sequence_format: Literal[AlignmentFormat.str] | Literal["str"]) -> list[str]:
+        ...
+
+    @overload
+    def get_aligned_sequences(
+        self, sequence_format: Literal[AlignmentFormat.list] | Literal["list"] = "list"
+    ) -> list[list[ItemToAlign | Gap]]:
+        ...
+
+    def get_aligned_sequences(
+        self, sequence_format: Literal["str"] | AlignmentFormat | Literal["list"] = "list"
+    ) -> list[str] | list[list[ItemToAlign | Gap]]:
+        """
+        Returns the aligned sequences, in the input order, as lists or as strings.
+        """
+        if not self._alignment:
+            self.align()
+        if sequence_format == AlignmentFormat.list:
+            return [list(row) for row in self._alignment]
+        elif sequence_format == AlignmentFormat.str:
+            return ["".join([str(x) for x in row]) for row in self._alignment]
+        else:
+            raise ValueError("Sequence_format has to be either 'list' or 'str'!")
+
+    def _compute_distances(self) -> dict[tuple[int, int], float]:
+        """
+        Computes the distances of all the pairs of sequences. With more than one worker, pairs
+        are sent in batches to a process pool, keeping at most max_pending batches in flight.
+        """
+        batches = self._iter_pair_batches()
+        distances: dict[tuple[int, int], float] = {}
+        if self.workers == 1:
+            for batch in batches:
+                distances.update(_pairwise_distances(batch, self.sequences, self.smatrix))
+            return distances
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.sequences, self.smatrix)
+        ) as executor:
+            pending: set[Future[list[tuple[tuple[int, int], float]]]] = set()
+            for batch in batches:
+                if len(pending) >= self.max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        distances.update(future.result())
+                pending.add(executor.submit(_worker_pairwise_distances, batch))
+            for future in pending:
+                distances.update(future.result())
+        return distances
+
+    def _iter_pair_batches(self) -> Iterator[list[tuple[int, int]]]:
+        pairs = combinations(range(len(self.sequences)), 2)
+        while batch := list(islice(pairs, self.batch_size)):
+            yield batch
+
+    def _build_guide_tree(self) -> GuideTree:
+        """
+        Builds the guide tree with UPGMA, keeping track of the nearest neighbour of each cluster.
+        """
+        nodes: dict[int, GuideTree] = {i: i for i in range(len(self.sequences))}
+        sizes = dict.fromkeys(nodes, 1)
+        distances: dict[int, dict[int, float]] = {i: {} for i in nodes}
+        for (i, j), distance in self._distances.items():
+            distances[i][j] = distance
+            distances[j][i] = distance
+
+        nearest = {i: min(distances[i].items(), key=lambda item: (item[1], item[0])) for i in nodes}
+        next_id = len(nodes)
+        while len(nodes) > 1:
+            i = min(nearest, key=lambda k: (nearest[k][1], k))
+            j = nearest[i][0]
+            merged = next_id
+            next_id += 1
+
+            distances[merged] = {}
+            for k in nodes:
+                if k in (i, j):
+                    continue
+                distance = (distances[i][k] * sizes[i] + distances[j][k] * sizes[j]) / (sizes[i] + sizes[j])
+                distances[merged][k] = distance
+                distances[k][merged] = distance
+                del distances[k][i], distances[k][j]
+
+            nodes[merged] = (nodes.pop(i), nodes.pop(j))
+            sizes[merged] = sizes.pop(i) + sizes.pop(j)
+            del distances[i], distances[j], nearest[i], nearest[j]
+
+            for k in nodes:
+                if k != merged and (nearest[k][0] in (i, j) or distances[k][merged] < nearest[k][1]):
+                    nearest[k] = min(distances[k].items(), key=lambda item: (item[1], item[0]))
+            if distances[merged]:
+                nearest[merged] = min(distances[merged].items(), key=lambda item: (item[1], item[0]))
+
+        return next(iter(nodes.values()))
+
+    def _align_node(self, node: GuideTree) -> tuple[list[Column], list[int], int | float]:
+        """
+        Returns the profile (list of columns), the sequence indexes of its rows and the
+        accumulated score of the alignment of the subtree.
+        """
+        if isinstance(node, int):
+            return [(item,) for item in self.sequences[node]], [node], 0
+
+        profile1, order1, score1 = self._align_node(node[0])
+        profile2, order2, score2 = self._align_node(node[1])
+        alignment = ProfileAlignment(profile1, profile2)
+        alignment.change_matrix(self.smatrix)
+        alignment.align()
+        return alignment.get_merged_profile(), order1 + order2, score1 + score2 + alignment.get_score()
+
+
+class ProfileAlignment(NeedlemanWunsch[Column]):
+    """
+    Needleman-Wunsch alignment of two profiles (lists of alignment columns). Columns are scored
+    with the average sum-of-pairs score of the ScoreMatrix, where gap-gap pairs score 0.
+    """
+
+    def __init__(self, profile1: Sequence[Column], profile2: Sequence[Column]) -> None:
+        super().__init__(profile1, profile2)
+        self._height1 = len(profile1[0]) if profile1 else 0
+        self._height2 = len(profile2[0]) if profile2 else 0
+        self._counts1 = [_count_column(column) for column in profile1]
+        self._counts2 = [_count_column(column) for column in profile2]
+
+    def get_merged_profile(self) -> list[Column]:
+        """
+        Returns the columns of the aligned profiles, filling gap columns with new Gap objects.
+        """
+        if not self._alseq1:
+            self.align()
+        if len(self._alseq1) != len(self._alseq2):
+            raise ValueError("Aligned profiles have different lengths.")
+        merged: list[Column] = []
+        for column1, column2 in zip(self._alseq1, self._alseq2):  # noqa: B905 (strict= needs Python 3.10)
+            if isinstance(column1, Gap):
+                column1 = tuple(Gap(self.gap_character) for _ in range(self._height1))
+            if isinstance(column2, Gap):
+                column2 = tuple(Gap(self.gap_character) for _ in range(self._height2))
+            merged.append(column1 + column2)
+        return merged
+
+    def _add_gap_penalties(self) -> None:
+        """
+        Fills number matrix first row and first column with the gap penalties.
+        """
+        for i in range(1, len(self.seq1) + 1):
+            self._nmatrix[0][i] = self._nmatrix[0][i - 1] + self._gap_score(self._counts1[i - 1])
+
+        for j in range(1, len(self.seq2) + 1):
+            self._nmatrix[j][0] = self._nmatrix[j - 1][0] + self._gap_score(self._counts2[j - 1])
+
+    def _fill_matrices(self) -> None:
+        gaps1 = [self._gap_score(counts) for counts in self._counts1]
+        for irow, counts2 in enumerate(self._counts2):
+            gap2 = self._gap_score(counts2)
+            for jcol, counts1 in enumerate(self._counts1):
+                topscore = self._nmatrix[irow][jcol + 1] + gap2
+                leftscore = self._nmatrix[irow + 1][jcol] + gaps1[jcol]
+                diagscore = self._nmatrix[irow][jcol] + self._column_score(counts1, counts2)
+
+                self._check_best_score(diagscore, topscore, leftscore, irow, jcol)
+
+    def _gap_score(self, counts: ColumnCounts) -> float:
+        """
+        Average score of aligning a column against a column made only of gaps.
+        """
+        _, gaps, height = counts
+        return self.smatrix.gap * (height - gaps) / height
+
+    def _column_score(self, counts1: ColumnCounts, counts2: ColumnCounts) -> float:
+        """
+        Average sum-of-pairs score of aligning two columns.
+        """
+        items1, gaps1, height1 = counts1
+        items2, gaps2, height2 = counts2
+        matches = 0
+        for item1, count1 in items1:
+            for item2, count2 in items2:
+                if item1 == item2:
+                    matches += count1 * count2
+        residues1, residues2 = height1 - gaps1, height2 - gaps2
+        score = (
+            self.smatrix.match * matches
+            + self.smatrix.miss * (residues1 * residues2 - matches)
+            + self.smatrix.gap * (gaps1 * residues2 + gaps2 * residues1)
+        )
+        return score / (height1 * height2)
+
+
+def _count_column(column: Column) -> ColumnCounts:
+    """
+    Counts the distinct items of a column using "==", so items do not need to be hashable.
+    Returns the [item, count] pairs, the number of gaps and the column height.
+    """
+    items: list[list[Any]] = []
+    gaps = 0
+    for item in column:
+        if isinstance(item, Gap):
+            gaps += 1
+            continue
+        for pair in items:
+            if pair[0] == item:
+                pair[1] += 1
+                break
+        else:
+            items.append([item, 1])
+    return items, gaps, len(column)
+
+
+def _init_worker(sequences: Sequence[Sequence[Any]], smatrix: ScoreMatrix) -> None:
+    global _worker_sequences, _worker_smatrix
+    _worker_sequences = sequences
+    _worker_smatrix = smatrix
+
+
+def _worker_pairwise_distances(batch: list[tuple[int, int]]) -> list[tuple[tuple[int, int], float]]:
+    """
+    Runs _pairwise_distances in a pool worker, with the sequences and matrix set by _init_worker.
+    """
+    return _pairwise_distances(batch, _worker_sequences, _worker_smatrix)
+
+
+def _pairwise_distances(
+    batch: list[tuple[int, int]], sequences: Sequence[Sequence[Any]], smatrix: ScoreMatrix
+) -> list[tuple[tuple[int, int], float]]:
+    """
+    Aligns each pair of sequences of the batch and returns their distances (1 - identity / 100).
+    Only the distances are kept, so the alignment matrices are freed after each pair.
+    """
+    distances = []
+    for i, j in batch:
+        alignment = NeedlemanWunsch(sequences[i], sequences[j])
+        alignment.change_matrix(smatrix)
+        alignment.align()
+        distances.append(((i, j), 1 - alignment.get_identity() / 100))
+    return distances
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from typing import Sequence
 
 from minineedle.core import OptimalAlignment
@@ -32,9 +34,11 @@ class NeedlemanWunsch(OptimalAlignment[ItemToAlign]):
         jmax = len(self._nmatrix[0]) - 1
         return imax, jmax
 
-    def _check_best_score(self, diagscore: int, topscore: int, leftscore: int, irow: int, jcol: int) -> None:
+    def _check_best_score(
+        self, diagscore: int | float, topscore: int | float, leftscore: int | float, irow: int, jcol: int
+    ) -> None:
         best_pointer = str()
-        best_score = int()
+        best_score: int | float = int()
         if diagscore >= topscore:
             if diagscore >= leftscore:
                 best_pointer, best_score = ("diag", diagscore)
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from typing import Optional, Sequence
 
 from minineedle.core import OptimalAlignment
@@ -29,7 +31,7 @@ class SmithWaterman(OptimalAlignment[ItemToAlign]):
         for Smith-Waterman will be the cell with the highest score.
         """
         imax, jmax = 0, 0
-        max_score = 0
+        max_score: int | float = 0
         for irow in range(0, len(self._nmatrix)):
             for jcol in range(0, len(self._nmatrix[0])):
                 score = self._nmatrix[irow][jcol]
@@ -39,9 +41,11 @@ class SmithWaterman(OptimalAlignment[ItemToAlign]):
                     max_score = score
         return imax, jmax
 
-    def _check_best_score(self, diagscore: int, topscore: int, leftscore: int, irow: int, jcol: int) -> None:
+    def _check_best_score(
+        self, diagscore: int | float, topscore: int | float, leftscore: int | float, irow: int, jcol: int
+    ) -> None:
         best_pointer: Optional[str] = ""
-        best_score = 0
+        best_score: int | float = 0
 
         if diagscore >= topscore:
             if diagscore >= leftscore:
@@ -1,5 +1,9 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 import pytest
-from minineedle import core, needle, smith
+from minineedle import aligner, cache, core, msa, needle, smith
 from typing_extensions import assert_type
 
 
@@ -380,3 +384,421 @@ def test_gap_char() -> None:
     gap = core.Gap("a")
 
     assert str(gap) == "a"
+
+
+def test_to_result_needleman() -> None:
+    """
+    Tests score, identity, coordinates and edit script of a Needleman-Wunsch AlignmentResult.
+    """
+    seq1 = "GCATGCU"
+    seq2 = "GATTACA"
+    needle_alignment = needle.NeedlemanWunsch(seq1, seq2)
+    needle_alignment.change_matrix(core.ScoreMatrix(1, -1, -1))
+    result = needle_alignment.to_result()
+
+    assert result.score == 0
+    assert result.identity == 50.0
+    assert (result.start1, result.end1, result.start2, result.end2) == (0, 7, 0, 7)
+    assert result.edit_script == "1=1D1=1I1=1X1=1X"
+
+
+def test_to_result_smith_coordinates() -> None:
+    """
+    Tests coordinates of a local alignment in its AlignmentResult.
+    """
+    seq1 = "TGTTACGG"
+    seq2 = "GGTTGACTA"
+    smith_alignment = smith.SmithWaterman(seq1, seq2)
+    smith_alignment.change_matrix(core.ScoreMatrix(3, -3, -2))
+    result = smith_alignment.to_result()
+
+    assert result.score == 13
+    assert (result.start1, result.end1, result.start2, result.end2) == (1, 6, 1, 7)
+    assert result.get_operations() == [(3, "="), (1, "I"), (2, "=")]
+
+
+def test_result_rebuilds_aligned_sequences() -> None:
+    """
+    Tests if AlignmentResult rebuilds the aligned sequences from the original ones.
+    """
+    seq1 = "TGTTACGG"
+    seq2 = "GGTTGACTA"
+    smith_alignment = smith.SmithWaterman(seq1, seq2)
+    smith_alignment.change_matrix(core.ScoreMatrix(3, -3, -2))
+    result = smith_alignment.to_result()
+
+    assert result.get_aligned_sequences(seq1, seq2) == smith_alignment.get_aligned_sequences()
+    assert result.get_aligned_sequences(seq1, seq2, "str", gap_character="+") == ("GTT+AC", "GTTGAC")
+
+
+def test_result_pickle() -> None:
+    """
+    Tests if AlignmentResult can be pickled and has no instance dictionary.
+    """
+    seq1 = "GCATGCU"
+    seq2 = "GATTACA"
+    result = needle.NeedlemanWunsch(seq1, seq2).to_result()
+    unpickled = pickle.loads(pickle.dumps(result))
+
+    assert unpickled == result
+    assert not hasattr(result, "__dict__")
+
+
+def test_release_matrices() -> None:
+    """
+    Tests if an alignment can be run again after releasing its matrices.
+    """
+    seq1 = "GCATGCU"
+    seq2 = "GATTACA"
+    needle_alignment = needle.NeedlemanWunsch(seq1, seq2)
+    needle_alignment.align()
+    result = needle_alignment.to_result()
+    needle_alignment.release_matrices()
+    needle_alignment.align()
+
+    assert needle_alignment.to_result() == result
+
+
+def test_get_almatrix_after_release_matrices() -> None:
+    """
+    Tests if get_almatrix realigns after releasing the matrices.
+    """
+    seq1 = "GCATGCU"
+    seq2 = "GATTACA"
+    needle_alignment = needle.NeedlemanWunsch(seq1, seq2)
+    needle_alignment.align()
+    expected_matrix = needle_alignment.get_almatrix()
+    needle_alignment.release_matrices()
+
+    assert needle_alignment.get_almatrix() == expected_matrix
+
+
+def test_empty_alignment_is_not_realigned(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Tests if getters do not realign when the alignment is empty.
+    """
+    smith_alignment = smith.SmithWaterman("AAA", "CCC")
+    smith_alignment.align()
+    calls = []
+    monkeypatch.setattr(smith_alignment, "align", lambda: calls.append(1))
+
+    assert smith_alignment.get_score() == 0
+    assert smith_alignment.get_identity() == 0.0
+    assert smith_alignment.to_result().edit_script == ""
+    assert calls == []
+
+
+def test_progressive_alignment() -> None:
+    """
+    Tests multiple alignment and guide tree of strings.
+    """
+    sequences = ["GCATGCU", "GATTACA", "GCATTACA", "GATGCU"]
+    alignment = msa.ProgressiveAlignment(sequences)
+    alignment.align()
+    aligned = alignment.get_aligned_sequences("str")
+
+    assert aligned == ["GCA-TGCU", "G-ATTACA", "GCATTACA", "G-A-TGCU"]
+    assert alignment.get_guide_tree() == ((1, 2), (0, 3))
+    assert [seq.replace("-", "") for seq in aligned] == sequences
+
+
+def test_progressive_alignment_lists() -> None:
+    """
+    Tests multiple alignment of lists and gap character change.
+    """
+    sequences = [[1, 2, 3, 5, 1], [1, 2, 9, 9, 9, 3, 5, 1], [1, 2, 9, 3, 5]]
+    alignment = msa.ProgressiveAlignment(sequences)
+    alignment.gap_character = "+"
+    aligned = alignment.get_aligned_sequences()
+
+    assert len({len(row) for row in aligned}) == 1
+    assert [[x for x in row if not isinstance(x, core.Gap)] for row in aligned] == sequences
+    assert "+" in alignment.get_aligned_sequences("str")[0]
+
+
+def test_progressive_alignment_workers() -> None:
+    """
+    Tests if pairwise distances computed by worker processes give the same alignment.
+    """
+    sequences = ["TGTTACGG", "GGTTGACTA", "TGTTGACGG", "GGTACTA", "TTACGG"]
+    single = msa.ProgressiveAlignment(sequences)
+    parallel = msa.ProgressiveAlignment(sequences, workers=2, batch_size=3, max_pending=1)
+
+    assert parallel.get_aligned_sequences("str") == single.get_aligned_sequences("str")
+    assert parallel.get_distance(1, 0) == single.get_distance(0, 1)
+
+
+def test_progressive_alignment_threads() -> None:
+    """
+    Tests if alignments running in different threads do not share their sequences.
+    """
+    groups = [["GCATGCU", "GATTACA", "GCATTACA", "GATGCU"], ["TGTTACGG", "GGTTGACTA", "TGTTGACGG", "TTACGG"]] * 4
+    expected = [msa.ProgressiveAlignment(group).get_aligned_sequences("str") for group in groups]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        aligned = list(executor.map(lambda group: msa.ProgressiveAlignment(group).get_aligned_sequences("str"), groups))
+
+    assert aligned == expected
+
+
+def test_progressive_alignment_wrong_input() -> None:
+    """
+    Tests if too few or empty sequences are rejected.
+    """
+    with pytest.raises(ValueError):
+        msa.ProgressiveAlignment(["ACTG"])
+    with pytest.raises(ValueError):
+        msa.ProgressiveAlignment(["ACTG", ""])
+
+
+def test_needleman_bytes_alignment() -> None:
+    """
+    Tests alignment of bytes and bytearray sequences.
+    """
+    seq1 = b"GCATGCU"
+    seq2 = bytearray(b"GATTACA")
+    needle_alignment = needle.NeedlemanWunsch(seq1, seq2)
+    needle_alignment.change_matrix(core.ScoreMatrix(1, -1, -1))
+    needle_alignment.align()
+    needle_alignment.gap_character = "-gap-"
+
+    assert needle_alignment.get_score() == 0
+    assert needle_alignment.get_aligned_sequences("str") == ("GCA-gap-TGCU", "G-gap-ATTACA")
+
+
+def test_str_matches_list_alignment() -> None:
+    """
+    Tests if str sequences are aligned as lists of characters.
+    """
+    seq1 = "TGTTACGGñ"
+    seq2 = "GGTTGACTAñ"
+    str_alignment = smith.SmithWaterman(seq1, seq2)
+    list_alignment = smith.SmithWaterman(list(seq1), list(seq2))
+    for alignment in (str_alignment, list_alignment):
+        alignment.change_matrix(core.ScoreMatrix(3, -3, -2))
+        alignment.align()
+        alignment.gap_character = "+"
+
+    assert str_alignment.get_almatrix() == list_alignment.get_almatrix()
+    assert str_alignment.get_aligned_sequences("str") == list_alignment.get_aligned_sequences("str")
+    assert str(str_alignment) == str(list_alignment)
+
+
+def test_str_surrogates() -> None:
+    """
+    Tests alignment of str sequences with lone surrogates.
+    """
+    needle_alignment = needle.NeedlemanWunsch("A\ud800C", "AC")
+    needle_alignment.align()
+
+    assert needle_alignment.get_score() == 1
+    assert needle_alignment.get_aligned_sequences("str") == ("A\ud800C", "A-C")
+
+
+def test_cache_hits() -> None:
+    """
+    Tests if repeated alignments are returned from the cache.
+    """
+    alignment_cache = cache.AlignmentCache()
+    matrix = core.ScoreMatrix(3, -3, -2)
+    first = alignment_cache.align(smith.SmithWaterman, "TGTTACGG", "GGTTGACTA", matrix)
+    second = alignment_cache.align(smith.SmithWaterman, "TGTTACGG", "GGTTGACTA", core.ScoreMatrix(3, -3, -2))
+
+    assert first is second
+    assert first.score == 13
+    with pytest.raises(AttributeError):
+        first.score = 0
+    assert (alignment_cache.stats.hits, alignment_cache.stats.misses) == (1, 1)
+    assert alignment_cache.stats.hit_rate == 0.5
+
+
+def test_cache_key() -> None:
+    """
+    Tests if cache keys depend on algorithm, matrix and sequences.
+    """
+    matrix = core.ScoreMatrix(1, -1, -1)
+    key = cache.AlignmentCache.get_key(needle.NeedlemanWunsch, "ACTG", "ACG", matrix)
+
+    assert key == cache.AlignmentCache.get_key(needle.NeedlemanWunsch, "ACTG", "ACG", core.ScoreMatrix(1, -1, -1))
+    assert key != cache.AlignmentCache.get_key(smith.SmithWaterman, "ACTG", "ACG", matrix)
+    assert key != cache.AlignmentCache.get_key(needle.NeedlemanWunsch, "ACTG", "ACG", core.ScoreMatrix(1, -1, -2))
+    assert key != cache.AlignmentCache.get_key(needle.NeedlemanWunsch, "ACT", "GACG", matrix)
+    assert key != cache.AlignmentCache.get_key(needle.NeedlemanWunsch, list("ACTG"), list("ACG"), matrix)
+    assert cache.AlignmentCache.get_key(needle.NeedlemanWunsch, [1, 2], [3], matrix) != cache.AlignmentCache.get_key(
+        needle.NeedlemanWunsch, ["1", "2"], ["3"], matrix
+    )
+
+
+class Residue:
+    """
+    Item with the default repr, which only contains its memory address.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Residue) and self.name == other.name
+
+
+def test_cache_default_repr_items() -> None:
+    """
+    Tests if items with the default repr are not cached.
+    """
+    alignment_cache = cache.AlignmentCache()
+    for seq1, seq2 in (("ACTG", "ACTG"), ("ACTG", "TTTT"), ("ACTG", "ACTG")):
+        residues1 = [Residue(x) for x in seq1]
+        residues2 = [Residue(x) for x in seq2]
+        result = alignment_cache.align(needle.NeedlemanWunsch, residues1, residues2)
+
+        assert result == needle.NeedlemanWunsch(residues1, residues2).to_result()
+
+    matrix = core.ScoreMatrix(1, -1, -1)
+    assert cache.AlignmentCache.get_key(needle.NeedlemanWunsch, residues1, residues2, matrix) is None
+    assert len(alignment_cache) == 0
+    assert (alignment_cache.stats.hits, alignment_cache.stats.misses) == (0, 3)
+
+
+def test_cache_tuple_items() -> None:
+    """
+    Tests if sequences of tuples are cached.
+    """
+    alignment_cache = cache.AlignmentCache()
+    alignment_cache.align(needle.NeedlemanWunsch, [(1, "A"), (2, "C")], [(1, "A")])
+    alignment_cache.align(needle.NeedlemanWunsch, [(1, "A"), (2, "C")], [(1, "A")])
+
+    assert alignment_cache.stats.hits == 1
+
+
+def test_result_immutable() -> None:
+    """
+    Tests if AlignmentResult attributes cannot be changed.
+    """
+    result = needle.NeedlemanWunsch("GCATGCU", "GATTACA").to_result()
+
+    with pytest.raises(AttributeError):
+        result.edit_script = ""
+    with pytest.raises(AttributeError):
+        del result.score
+
+
+def test_cache_eviction() -> None:
+    """
+    Tests if least recently used results are evicted when the cache is full.
+    """
+    sizes = [48 + len(needle.NeedlemanWunsch(seq, "ACTG").to_result().edit_script) for seq in ("ACTA", "ACTC")]
+    alignment_cache = cache.AlignmentCache(max_bytes=sum(sizes))
+    for seq in ("ACTG", "ACTA", "ACTC"):
+        alignment_cache.align(needle.NeedlemanWunsch, seq, "ACTG")
+    alignment_cache.align(needle.NeedlemanWunsch, "ACTC", "ACTG")
+
+    assert len(alignment_cache) == 2
+    assert alignment_cache.size == sum(sizes)
+    assert alignment_cache.stats.evictions == 1
+    assert alignment_cache.stats.hits == 1
+
+
+def test_cache_disk(tmp_path: Any) -> None:
+    """
+    Tests if results are read back from the sqlite database.
+    """
+    path = str(tmp_path / "alignments.sqlite")
+    with cache.AlignmentCache(max_bytes=0, path=path) as alignment_cache:
+        result = alignment_cache.align(needle.NeedlemanWunsch, "GCATGCU", "GATTACA")
+        assert len(alignment_cache) == 0
+
+    with cache.AlignmentCache(path=path) as alignment_cache:
+        assert alignment_cache.align(needle.NeedlemanWunsch, "GCATGCU", "GATTACA") == result
+        assert alignment_cache.stats.disk_hits == 1
+        assert len(alignment_cache) == 1
+
+
+def test_cache_disk_score_types(tmp_path: Any) -> None:
+    """
+    Tests if int and float scores keep their type when read back from the sqlite database.
+    """
+    path = str(tmp_path / "alignments.sqlite")
+    matrices = (core.ScoreMatrix(1, -1, -1), core.ScoreMatrix(1.5, -1, -0.5))
+    with cache.AlignmentCache(max_bytes=0, path=path) as alignment_cache:
+        results = [alignment_cache.align(smith.SmithWaterman, "GCATGCU", "GATTACA", matrix) for matrix in matrices]
+
+    with cache.AlignmentCache(path=path) as alignment_cache:
+        for matrix, result in zip(matrices, results):  # noqa: B905 (strict= needs Python 3.10)
+            disk_result = alignment_cache.align(smith.SmithWaterman, "GCATGCU", "GATTACA", matrix)
+            assert disk_result == result
+            assert type(disk_result.score) is type(result.score)
+        assert alignment_cache.stats.disk_hits == 2
+
+
+def test_aligner_matches_alignment_objects() -> None:
+    """
+    Tests if Aligner gives the same results as the alignment classes.
+    """
+    pairs = [("GCATGCU", "GATTACA"), ("TGTTACGG", "GGTTGACTA"), ("AC", "TGTTACGG"), ("", "ACT"), ("XA", "A")]
+    for algorithm in (needle.NeedlemanWunsch, smith.SmithWaterman):
+        reusable = aligner.Aligner(algorithm)
+        reusable.change_matrix(core.ScoreMatrix(3, -3, -2))
+        for seq1, seq2 in pairs + [(list(seq1), list(seq2)) for seq1, seq2 in pairs]:
+            alignment = algorithm(seq1, seq2)
+            alignment.change_matrix(core.ScoreMatrix(3, -3, -2))
+
+            assert reusable.align(seq1, seq2) == alignment.to_result()
+
+
+def test_aligner_reuses_buffers() -> None:
+    """
+    Tests if Aligner gives correct results after aligning a bigger pair.
+    """
+    reusable = aligner.Aligner(smith.SmithWaterman)
+    reusable.align("GCATGCUGCATGCU", "GCATGCUGCATGCU")
+    result = reusable.align("GCATGCU", "GATTACA")
+
+    assert result == smith.SmithWaterman("GCATGCU", "GATTACA").to_result()
+    reusable = aligner.Aligner()
+    reusable.align("GCATGCUGCATGCU", "GATTACAGATTACA")
+    result = reusable.align("GCATGCU", "GATTACA")
+
+    assert result.score == 0
+    assert result.edit_script == "1=1D1=1I1=1X1=1X"
+
+
+def test_aligner_frees_oversized_buffers() -> None:
+    """
+    Tests if Aligner frees buffers bigger than max_buffer_size.
+    """
+    reusable = aligner.Aligner(max_buffer_size=100)
+    reusable.align("GCATGCU", "GATTACA")
+    assert reusable.buffer_size == 64
+
+    result = reusable.align("GCATGCUGCATGCU", "GATTACAGATTACA")
+    assert reusable.buffer_size == 0
+    assert result == needle.NeedlemanWunsch("GCATGCUGCATGCU", "GATTACAGATTACA").to_result()
+
+
+def test_aligner_surrogates() -> None:
+    """
+    Tests if Aligner accepts str sequences with lone surrogates.
+    """
+    result = aligner.Aligner().align("A\ud800C", "AC")
+
+    assert result.score == 1
+    assert result.edit_script == "1=1D1="
+
+
+def test_align_pairs() -> None:
+    """
+    Tests alignment of a list of pairs.
+    """
+    results = aligner.align_pairs([("TGTTACGG", "GGTTGACTA")], smith.SmithWaterman, core.ScoreMatrix(3, -3, -2))
+
+    assert [result.score for result in results] == [13]
+
+
+def test_aligner_wrong_algorithm() -> None:
+    """
+    Tests if Aligner rejects algorithms other than NeedlemanWunsch and SmithWaterman.
+    """
+    with pytest.raises(ValueError):
+        aligner.Aligner(msa.ProfileAlignment)